@@ -73,6 +73,16 @@ class Widget(qt.QWidget):
         self.installLogic.progressInfo.connect(self.onProgressInfo)
         self.isStopping = False
 
+        # Cached copies of the parameter node / logic state queried by the hot
+        # UI update paths, to avoid MRML attribute roundtrips on every refresh
+        self._useApi = False
+        self._hasApiSeg = False
+
+        # Progress messages are batched and flushed to the log on a short
+        # timer so a message burst triggers one text insert + processEvents
+        self._pendingMsgs = []
+        self._flushPending = False
+
         self.sceneCloseObserver = slicer.mrmlScene.AddObserver(slicer.mrmlScene.EndCloseEvent, self.onSceneChanged)
         self._doShowErrorWindows = doShowInfoWindows
 
@@ -110,6 +120,7 @@ class Widget(qt.QWidget):
     def _updateRadioButtonsFromParameter(self):
         """Update radio button state from parameter"""
         useApi = self._parameterNode.useApi
+        self._useApi = useApi
         self.ui.useApiRadioButton.blockSignals(True)
         self.ui.useLocalRadioButton.blockSignals(True)
         
@@ -122,17 +133,19 @@ class Widget(qt.QWidget):
     def onLocalRadioButtonToggled(self, checked):
         if checked:
             self._parameterNode.useApi = False
+            self._useApi = False
             self._updateModeBasedUI()
 
     def onApiRadioButtonToggled(self, checked):
         if checked:
             self._parameterNode.useApi = True
+            self._useApi = True
             self._updateModeBasedUI()
 
     def _updateModeBasedUI(self):
         """Update UI elements based on selected mode (API or local)"""
-        useApi = self._parameterNode.useApi
-        
+        useApi = self._useApi
+
         if useApi:
             self.logic = self.apiLogic
             self.apiLogic.setApiUrl(self._parameterNode.apiUrl)
@@ -142,7 +155,7 @@ class Widget(qt.QWidget):
             self.ui.nnUNetSettingsCollapsibleButton.setEnabled(True)
             
         # Update upload button state
-        shouldEnableUpload = useApi and self.apiLogic.getCurrentSegmentation() is not None
+        shouldEnableUpload = useApi and self._hasApiSeg
         self.ui.uploadButton.setEnabled(shouldEnableUpload)
         
         # Show/hide appropriate collapsible buttons based on mode
@@ -177,7 +190,7 @@ class Widget(qt.QWidget):
         self.ui.inputSelector.setEnabled(isEnabled)
         
         # Only enable upload button if API is selected and we have a current segmentation
-        shouldEnableUpload = isEnabled and self._parameterNode.useApi and self.apiLogic.getCurrentSegmentation() is not None
+        shouldEnableUpload = isEnabled and self._useApi and self._hasApiSeg
         self.ui.uploadButton.setEnabled(shouldEnableUpload)
 
     def onUploadClicked(self):
@@ -253,11 +266,12 @@ class Widget(qt.QWidget):
             return
 
         self.ui.logTextEdit.clear()
+        self._pendingMsgs.clear()
         self.onProgressInfo("Start")
         self.onProgressInfo("*" * 80)
 
         # If using API, check if API URL is set
-        if self._parameterNode.useApi:
+        if self._useApi:
             if not self._parameterNode.apiUrl:
                 self._reportError("Please enter an API URL to proceed with API-based segmentation.")
                 return
@@ -283,11 +297,11 @@ class Widget(qt.QWidget):
         self._setButtonsEnabled(isVisible)
 
     def _runSegmentation(self):
-        if not self._parameterNode.useApi and self.installLogic.needsRestart:
+        if not self._useApi and self.installLogic.needsRestart:
             self.onInferenceFinished()
             return
 
-        if not self._parameterNode.useApi:
+        if not self._useApi:
             self._parameterNode.parameter.toSettings()
             self.localLogic.setParameter(self._parameterNode.parameter)
             
@@ -308,6 +322,7 @@ class Widget(qt.QWidget):
             self.onProgressInfo("Loading inference results...")
             segmentation = self.logic.loadSegmentation()
             segmentation.SetName(self.getCurrentVolumeNode().GetName() + "Segmentation")
+            self._hasApiSeg = self.apiLogic.getCurrentSegmentation() is not None
             self._reportFinished("Inference ended successfully.")
         except RuntimeError as e:
             self._reportError(f"Inference ended in error:\n{e}")
@@ -324,7 +339,18 @@ class Widget(qt.QWidget):
         self._reportError("Encountered error during inference :\n" + errorMsg, doTraceback=False)
 
     def onProgressInfo(self, infoMsg):
-        self.ui.logTextEdit.insertPlainText(self._formatMsg(infoMsg) + "\n")
+        self._pendingMsgs.append(self._formatMsg(infoMsg))
+        if not self._flushPending:
+            self._flushPending = True
+            qt.QTimer.singleShot(50, self._flushLog)
+
+    def _flushLog(self):
+        self._flushPending = False
+        if not self._pendingMsgs:
+            return
+
+        self.ui.logTextEdit.insertPlainText("\n".join(self._pendingMsgs) + "\n")
+        self._pendingMsgs.clear()
         self.moveTextEditToEnd(self.ui.logTextEdit)
         slicer.app.processEvents()
 
@@ -0,0 +1,177 @@
+import gzip
+import io
+import time
+from unittest.mock import MagicMock
+
+import numpy as np
+import slicer
+
+from SlicerNNUNetLib import ApiSegmentationLogic
+from Testing.Utils import NNUNetTestCase
+
+
+class MockRaw(io.BytesIO):
+    """Response body stream accepting the decode_content attribute set by
+    the download code (a plain BytesIO rejects arbitrary attributes)."""
+    decode_content = False
+
+
+class MockResponse:
+    def __init__(self, status_code=200, body=b"", headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = body
+        self.raw = MockRaw(body)
+
+
+class ApiSegmentationLogicTestCase(NNUNetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.logic = ApiSegmentationLogic()
+        self.logic.setApiUrl("http://mock-api")
+
+        # Skip the encoding probe and pin the upload format to NIfTI + gzip
+        self.logic._serverSupportsZstd = False
+
+        # The session is created lazily, so injecting the mock before the
+        # first request replaces every HTTP call
+        self.session = MagicMock()
+        self.logic._session = self.session
+
+        self.mockFinished = MagicMock()
+        self.mockBatchFinished = MagicMock()
+        self.mockError = MagicMock()
+        self.mockInfo = MagicMock()
+        self.logic.inferenceFinished.connect(self.mockFinished)
+        self.logic.batchFinished.connect(self.mockBatchFinished)
+        self.logic.errorOccurred.connect(self.mockError)
+        self.logic.progressInfo.connect(self.mockInfo)
+
+    def tearDown(self):
+        self.logic.stopSegmentation()
+        super().tearDown()
+
+    @staticmethod
+    def _waitUntil(condition, timeout_s=10.0):
+        """Pump the Qt event loop until condition holds (the worker reports
+        through a queue drained by a main thread timer)."""
+        start = time.time()
+        while time.time() - start < timeout_s:
+            slicer.app.processEvents()
+            if condition():
+                return True
+            time.sleep(0.05)
+        return False
+
+    @staticmethod
+    def _createVolumeNode(name="TestVolume"):
+        volumeNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLScalarVolumeNode", name)
+        arr = np.zeros((4, 5, 6), dtype=np.int16)
+        arr[1:3, 1:4, 2:5] = 42
+        slicer.util.updateVolumeFromArray(volumeNode, arr)
+        return volumeNode
+
+    @staticmethod
+    def _createSingleSegmentSegmentationNode():
+        labelArr = np.zeros((4, 5, 6), dtype=np.uint8)
+        labelArr[1:3, 1:4, 2:5] = 1
+        labelmapNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLLabelMapVolumeNode")
+        slicer.util.updateVolumeFromArray(labelmapNode, labelArr)
+        segmentationNode = slicer.mrmlScene.AddNewNodeByClass("vtkMRMLSegmentationNode")
+        slicer.modules.segmentations.logic().ImportLabelmapToSegmentationNode(
+            labelmapNode, segmentationNode)
+        slicer.mrmlScene.RemoveNode(labelmapNode)
+        return segmentationNode
+
+    @staticmethod
+    def _niftiGzBody(arr):
+        import nibabel
+
+        img = nibabel.Nifti1Image(arr.T, np.eye(4))
+        buf = io.BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode='wb') as gz:
+            gz.write(img.to_bytes())
+        return buf.getvalue()
+
+    def test_predict_round_trip_loads_segmentation(self):
+        segArr = np.zeros((4, 5, 6), dtype=np.int16)
+        segArr[1:3, 1:4, 2:5] = 1
+        self.session.post.return_value = MockResponse(
+            body=self._niftiGzBody(segArr), headers={'X-File-ID': 'file-42'})
+
+        self.logic.startSegmentation(self._createVolumeNode())
+        self.assertTrue(self._waitUntil(lambda: self.mockFinished.call_count))
+
+        self.session.post.assert_called_once()
+        self.mockError.assert_not_called()
+        self.assertEqual(self.logic._currentFileId, "file-42")
+
+        segmentationNode = self.logic.loadSegmentation()
+        self.assertIsNotNone(segmentationNode)
+        self.assertEqual(segmentationNode.GetSegmentation().GetNumberOfSegments(), 1)
+
+    def test_start_reports_error_when_api_fails(self):
+        self.session.post.return_value = MockResponse(status_code=500, body=b"boom")
+
+        self.logic.startSegmentation(self._createVolumeNode())
+        self.assertTrue(self._waitUntil(lambda: self.mockError.call_count))
+        self.mockFinished.assert_not_called()
+
+    def test_batch_predict_writes_per_volume_files_and_fires_batch_finished(self):
+        segArr = np.zeros((4, 5, 6), dtype=np.int16)
+        segArr[1:3, 1:4, 2:5] = 1
+        body = self._niftiGzBody(segArr)
+        self.session.post.side_effect = lambda *args, **kwargs: MockResponse(
+            body=body, headers={'X-File-ID': 'file-42'})
+
+        volumes = [self._createVolumeNode(f"Volume{i}") for i in range(3)]
+        volumes[1].SetName("Volume0")  # Duplicate of the first volume name
+        volumes[2].SetName("a/b:volume")  # Path separator and Windows-invalid character
+
+        self.logic.startSegmentationBatch(volumes, max_in_flight=2)
+        self.assertTrue(self._waitUntil(lambda: self.mockBatchFinished.call_count))
+
+        self.mockError.assert_not_called()
+        self.mockFinished.assert_not_called()
+        self.assertEqual(self.session.post.call_count, 3)
+        self.assertEqual(set(self.logic.batchFileIds),
+                         {"Volume0.nii.gz", "Volume0_1.nii.gz", "a_b_volume.nii.gz"})
+        self.assertEqual(set(self.logic.batchFileIds.values()), {"file-42"})
+        for fileName in self.logic.batchFileIds:
+            baseName = fileName[:-len(".nii.gz")]
+            self.assertTrue((self.logic.nnUNetOutDir / f"{baseName}_segmentation.nii.gz").exists())
+
+    def test_batch_reports_aggregated_errors(self):
+        self.session.post.return_value = MockResponse(status_code=500, body=b"boom")
+
+        self.logic.startSegmentationBatch(
+            [self._createVolumeNode("VolumeA"), self._createVolumeNode("VolumeB")])
+        self.assertTrue(self._waitUntil(lambda: self.mockError.call_count))
+
+        self.mockBatchFinished.assert_not_called()
+        errorMessage = self.mockError.call_args[0][0]
+        self.assertIn("VolumeA", errorMessage)
+        self.assertIn("VolumeB", errorMessage)
+
+    def test_upload_reuses_serialized_bytes_when_segmentation_unchanged(self):
+        self.logic._currentFileId = "file-42"
+        self.session.post.return_value = MockResponse()
+        serializeSpy = MagicMock(wraps=self.logic._segmentationToNiftiBuffer)
+        self.logic._segmentationToNiftiBuffer = serializeSpy
+        segmentationNode = self._createSingleSegmentSegmentationNode()
+
+        self.assertTrue(self.logic.uploadSegmentation(segmentationNode))
+        self.assertTrue(self.logic.uploadSegmentation(segmentationNode))
+
+        serializeSpy.assert_called_once()
+        self.assertEqual(self.session.post.call_count, 2)
+
+    def test_single_segment_upload_takes_direct_labelmap_path(self):
+        self.logic._currentFileId = "file-42"
+        self.session.post.return_value = MockResponse()
+        fastPathSpy = MagicMock(wraps=self.logic._orientedImageToNiftiBuffer)
+        self.logic._orientedImageToNiftiBuffer = fastPathSpy
+
+        self.assertTrue(self.logic.uploadSegmentation(self._createSingleSegmentSegmentationNode()))
+        fastPathSpy.assert_called_once()
+        self.mockError.assert_not_called()